@@ -1,16 +1,192 @@
 #!/usr/bin/python3
 import argparse
+import atexit
+import collections
+import contextlib
 import subprocess
 import os
+import sys
 import datetime
-import glob
+import functools
+import logging
+import queue
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
 import psycopg2
+import psycopg2.extras
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.pool import ThreadedConnectionPool
+
+# psycopg 3 is optional; when available (with libpq 14+) destination writes
+# that need no COPY are sent in pipeline mode
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+DB_ERRORS = (psycopg2.Error, psycopg.Error) if psycopg else (psycopg2.Error,)
+
+logger = logging.getLogger('dbmigrate')
+
+# Size of the buffer used when streaming COPY data between servers
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Rows per multi-row INSERT when copying with --use-inserts
+INSERT_BATCH_SIZE = 1000
+
+# Most bind parameters a single statement can carry in the extended protocol
+MAX_QUERY_PARAMETERS = 65535
+
+# Database used for server-level queries (listing, creating databases)
+MAINTENANCE_DB = 'postgres'
+
+# Lowest OID assigned to user-created objects (FirstNormalObjectId); type
+# OIDs above it differ between clusters
+FIRST_NORMAL_OBJECT_ID = 16384
+
+# Schema sections restored before and after the table data
+SCHEMA_SECTIONS = ('pre-data', 'post-data')
+
+# Lines of pg_dump/pg_restore output kept for error reports
+STDERR_TAIL_LINES = 200
+
+# Printed by pg_restore when it exits 1 only because some statements failed,
+# e.g. ALTER ... OWNER TO a role missing on the destination
+PG_RESTORE_IGNORED_ERRORS = 'errors ignored on restore'
+
+# psql meta-commands pg_dump may emit in plain-format output
+PSQL_META_COMMANDS = ('\\restrict ', '\\unrestrict ')
+
+# PostgreSQL tool locations; pg_isready is optional and may be None
+PgTools = collections.namedtuple('PgTools', ['pg_dump', 'pg_restore', 'pg_isready'])
+
+# Installation roots searched on Windows, which has no PostgreSQL in PATH by default
+WINDOWS_PG_ROOTS = [
+    r"C:\Program Files\PostgreSQL",
+    r"C:\Program Files (x86)\PostgreSQL",
+    r"C:\PostgreSQL"
+]
+
+
+def _version_key(name):
+    """Sort key for a version directory name such as '16' or '9.6' (None if not a version)"""
+    try:
+        return tuple(int(part) for part in name.split('.'))
+    except ValueError:
+        return None
+
+
+def _windows_bin_dirs():
+    """bin directories of installed PostgreSQL versions on Windows, newest first"""
+    versions = []
+    for root in WINDOWS_PG_ROOTS:
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    key = _version_key(entry.name)
+                    if key and entry.is_dir():
+                        versions.append((key, os.path.join(entry.path, 'bin')))
+        except OSError:
+            continue
+    return [path for _, path in sorted(versions, reverse=True)]
+
+
+@functools.lru_cache(maxsize=1)
+def _locate_pg_tools():
+    """Find PostgreSQL tools (pg_dump, pg_restore and optionally pg_isready) once per process"""
+    # First, try to find in PATH
+    tools = PgTools(*(shutil.which(name) for name in PgTools._fields))
+    if tools.pg_dump and tools.pg_restore:
+        logger.info("✓ Found PostgreSQL tools in system PATH")
+        return tools
+
+    # On Windows, fall back to the newest installed version
+    if sys.platform == 'win32':
+        for path in _windows_bin_dirs():
+            candidates = [os.path.join(path, f"{name}.exe") for name in PgTools._fields]
+            found = [candidate if os.path.exists(candidate) else None for candidate in candidates]
+            tools = PgTools(*found)
+            if tools.pg_dump and tools.pg_restore:
+                logger.info(f"✓ Found PostgreSQL tools at: {path}")
+                return tools
+
+    logger.warning("⚠ PostgreSQL tools not found. Please ensure PostgreSQL is installed and in PATH.")
+    if sys.platform == 'win32':
+        logger.info("Common locations to check:")
+        logger.info("  - C:\\Program Files\\PostgreSQL\\15\\bin")
+        logger.info("  - C:\\Program Files\\PostgreSQL\\14\\bin")
+    return PgTools(None, None, None)
+
+
+# Listener started by setup_logging, None when logging is not set up
+_log_listener = None
+
+
+def setup_logging(debug=False):
+    """Send log records through a queue written by a single listener thread.
+
+    Worker threads only enqueue records, so they never contend for the
+    terminal. Returns the started listener; call stop_logging() before exiting.
+    """
+    global _log_listener
+    stop_logging()
+
+    log_queue = queue.Queue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, handler)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    logger.propagate = False
+    listener.start()
+    _log_listener = listener
+    return listener
+
+
+def stop_logging():
+    """Write out queued records and detach the handler added by setup_logging"""
+    global _log_listener
+    if _log_listener is None:
+        return
+
+    _log_listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is _log_listener.queue:
+            logger.removeHandler(handler)
+    _log_listener = None
+
+
+def _flush_logging():
+    """Wait until queued log records have been written"""
+    if _log_listener is not None:
+        _log_listener.queue.join()
+
+
+class _LazyConnectionPool(ThreadedConnectionPool):
+    """ThreadedConnectionPool that opens connections on demand.
+
+    ThreadedConnectionPool opens minconn connections up front and closes
+    returned connections beyond minconn; this one opens none up front but
+    keeps up to idle returned connections for reuse.
+    """
+
+    def __init__(self, idle, maxconn, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        # Only consulted when a connection is returned
+        self.minconn = idle
 
 
 class BulkDBMigrator:
     def __init__(self, source_host, source_user, source_password,
-                 dest_host, dest_user, dest_password, port=5432, use_inserts=False):
+                 dest_host, dest_user, dest_password, port=5432, use_inserts=False,
+                 copy_chunk_size=COPY_CHUNK_SIZE, jobs=1, pg_jobs=1, compress='0', inprocess=False,
+                 debug=False, maintenance_work_mem='2GB', no_owner=False):
         self.source_host = source_host
         self.source_user = source_user
         self.source_password = source_password
@@ -19,122 +195,201 @@ class BulkDBMigrator:
         self.dest_password = dest_password
         self.port = port
         self.use_inserts = use_inserts
-        self.temp_dir = './migration_temp'
-
-        # Create temp directory for migration files
-        os.makedirs(self.temp_dir, exist_ok=True)
-
-        # Find PostgreSQL tools
-        self.pg_dump_path, self.psql_path = self.find_postgresql_tools()
-
-    def find_postgresql_tools(self):
-        """Find PostgreSQL tools (pg_dump, psql) on the system"""
-        # Common PostgreSQL installation paths on Windows
-        common_paths = [
-            r"C:\Program Files\PostgreSQL\*\bin",
-            r"C:\Program Files (x86)\PostgreSQL\*\bin",
-            r"C:\PostgreSQL\*\bin",
-            "/usr/bin",
-            "/usr/local/bin",
-            "/opt/postgresql/*/bin"
-        ]
-
-        pg_dump_path = None
-        psql_path = None
-
-        # First, try to find in PATH
-        try:
-            result = subprocess.run(['pg_dump', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                pg_dump_path = 'pg_dump'
-                psql_path = 'psql'
-                print("✓ Found PostgreSQL tools in system PATH")
-                return pg_dump_path, psql_path
-        except:
-            pass
-
-        # Search in common installation directories
-        for path_pattern in common_paths:
-            try:
-                for path in glob.glob(path_pattern):
-                    pg_dump_candidate = os.path.join(path, 'pg_dump.exe' if os.name == 'nt' else 'pg_dump')
-                    psql_candidate = os.path.join(path, 'psql.exe' if os.name == 'nt' else 'psql')
-
-                    if os.path.exists(pg_dump_candidate) and os.path.exists(psql_candidate):
-                        pg_dump_path = pg_dump_candidate
-                        psql_path = psql_candidate
-                        print(f"✓ Found PostgreSQL tools at: {path}")
-                        return pg_dump_path, psql_path
-            except:
-                continue
-
-        print("⚠ PostgreSQL tools not found. Please ensure PostgreSQL is installed and in PATH.")
-        print("Common locations to check:")
-        print("  - C:\\Program Files\\PostgreSQL\\15\\bin")
-        print("  - C:\\Program Files\\PostgreSQL\\14\\bin")
-        return None, None
-
-    def get_connection(self, use_destination=False, database='postgres'):
-        """Get database connection to source or destination"""
-        try:
-            if use_destination:
-                conn = psycopg2.connect(
-                    host=self.dest_host,
-                    port=self.port,
-                    database=database,
-                    user=self.dest_user,
-                    password=self.dest_password
-                )
-            else:
-                conn = psycopg2.connect(
-                    host=self.source_host,
-                    port=self.port,
-                    database=database,
-                    user=self.source_user,
-                    password=self.source_password
+        self.copy_chunk_size = copy_chunk_size
+        self.jobs = jobs
+        self.pg_jobs = pg_jobs
+        self.compress = compress
+        self.inprocess = inprocess
+        self.debug = debug
+        self.no_owner = no_owner
+
+        # Session settings for loading into the destination: commits don't
+        # wait for WAL flush and index builds get a large sort budget. A crash
+        # can lose recently committed rows, which is acceptable because the
+        # source stays the authoritative copy.
+        self.bulk_load_options = f"-c synchronous_commit=off -c maintenance_work_mem={maintenance_work_mem}"
+
+        # Private temp directory, on tmpfs when available since schema
+        # backups are small and read back straight away
+        temp_root = os.environ.get(
+            'DBMIGRATE_TMPDIR', '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        )
+        self.temp_dir = tempfile.mkdtemp(prefix='dbmigrate-', dir=temp_root)
+        atexit.register(shutil.rmtree, self.temp_dir, ignore_errors=True)
+
+        # Connection pools to the maintenance database, keyed by use_destination,
+        # and the pooled connections currently handed out
+        self._pools = {}
+        self._pooled = set()
+        self._pool_lock = threading.Lock()
+
+        # Find PostgreSQL tools (cached after the first migrator)
+        self.pg_dump_path, self.pg_restore_path, self.pg_isready_path = _locate_pg_tools()
+
+    def _connection_params(self, use_destination, database=None):
+        """Connection parameters for source or destination (database None for maintenance)"""
+        if use_destination:
+            params = dict(
+                host=self.dest_host,
+                port=self.port,
+                database=MAINTENANCE_DB if database is None else database,
+                user=self.dest_user,
+                password=self.dest_password
+            )
+            # Connections into a migrated database are only used for bulk loading
+            if database is not None:
+                params['options'] = self.bulk_load_options
+            return params
+        return dict(
+            host=self.source_host,
+            port=self.port,
+            database=MAINTENANCE_DB if database is None else database,
+            user=self.source_user,
+            password=self.source_password
+        )
+
+    def _get_pool(self, use_destination):
+        """Get (creating on first use) the maintenance database pool for one side"""
+        with self._pool_lock:
+            pool = self._pools.get(use_destination)
+            if pool is None:
+                # Keep one idle connection per worker, opened only when needed
+                pool = _LazyConnectionPool(
+                    self.jobs, self.jobs + 2, **self._connection_params(use_destination)
                 )
-            return conn
+                self._pools[use_destination] = pool
+            return pool
+
+    def get_connection(self, use_destination=False, database=None):
+        """Get database connection to source or destination.
+
+        Without a database, a maintenance database connection is taken from
+        the pool shared by all workers; with one, a new connection is opened
+        (even to the maintenance database). Hand every connection back with
+        release_connection().
+        """
+        try:
+            if database is None:
+                conn = self._get_pool(use_destination).getconn()
+                with self._pool_lock:
+                    self._pooled.add(conn)
+                return conn
+            return psycopg2.connect(**self._connection_params(use_destination, database))
         except psycopg2.Error as e:
-            print(f"Connection error: {e}")
+            logger.error(f"Connection error: {e}")
             return None
 
+    def get_pipeline_connection(self, database):
+        """Get a psycopg 3 destination connection supporting pipeline mode, if available"""
+        # Pipeline mode needs psycopg 3.1+ built against libpq 14+
+        pipeline = getattr(psycopg, 'Pipeline', None)
+        if pipeline is None or not pipeline.is_supported():
+            return None
+
+        params = self._connection_params(use_destination=True, database=database)
+        params['dbname'] = params.pop('database')
+        try:
+            return psycopg.connect(**params)
+        except psycopg.Error as e:
+            logger.error(f"Connection error: {e}")
+            return None
+
+    def release_connection(self, conn, use_destination=False):
+        """Return a pooled connection to its pool, or close a per-database one"""
+        with self._pool_lock:
+            pooled = conn in self._pooled
+            self._pooled.discard(conn)
+        if not pooled:
+            conn.close()
+            return
+
+        # Reset session state so the next user gets a clean connection
+        if not conn.closed:
+            try:
+                conn.rollback()
+                conn.autocommit = False
+            except psycopg2.Error:
+                conn.close()
+        self._get_pool(use_destination).putconn(conn)
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            for pool in self._pools.values():
+                pool.closeall()
+            self._pools.clear()
+
     def test_connections(self):
         """Test both source and destination connections"""
-        print("Testing connections...")
+        logger.info("Testing connections...")
 
         # Check if PostgreSQL tools are available
-        if not self.pg_dump_path or not self.psql_path:
-            print("✗ PostgreSQL tools (pg_dump/psql) not found!")
-            print("Please ensure PostgreSQL is installed and accessible.")
+        if not self.pg_dump_path or not (self.pg_restore_path or self.inprocess):
+            logger.error("✗ PostgreSQL tools (pg_dump/pg_restore) not found!")
+            logger.info("Please ensure PostgreSQL is installed and accessible.")
             return False
         else:
-            print(f"✓ Using pg_dump: {self.pg_dump_path}")
-            print(f"✓ Using psql: {self.psql_path}")
+            logger.info(f"✓ Using pg_dump: {self.pg_dump_path}")
+            if self.inprocess:
+                logger.info(f"✓ Applying schema in-process")
+            else:
+                logger.info(f"✓ Using pg_restore: {self.pg_restore_path}")
 
         # Show dump format
-        dump_format = "INSERT statements" if self.use_inserts else "COPY statements"
-        print(f"✓ Dump format: {dump_format}")
+        dump_format = "INSERT statements" if self.use_inserts else "binary COPY stream"
+        logger.info(f"✓ Dump format: {dump_format}")
 
         # Test source
-        source_conn = self.get_connection(use_destination=False)
-        if source_conn:
-            print(f"✓ Source connection successful ({self.source_host})")
-            source_conn.close()
+        if not self._probe_reachable(self.source_host):
+            logger.error(f"✗ Source server not accepting connections ({self.source_host})")
+            return False
+        if self._check_connection(use_destination=False):
+            logger.info(f"✓ Source connection successful ({self.source_host})")
         else:
-            print(f"✗ Source connection failed ({self.source_host})")
+            logger.error(f"✗ Source connection failed ({self.source_host})")
             return False
 
         # Test destination
-        dest_conn = self.get_connection(use_destination=True)
-        if dest_conn:
-            print(f"✓ Destination connection successful ({self.dest_host})")
-            dest_conn.close()
+        if not self._probe_reachable(self.dest_host):
+            logger.error(f"✗ Destination server not accepting connections ({self.dest_host})")
+            return False
+        if self._check_connection(use_destination=True):
+            logger.info(f"✓ Destination connection successful ({self.dest_host})")
         else:
-            print(f"✗ Destination connection failed ({self.dest_host})")
+            logger.error(f"✗ Destination connection failed ({self.dest_host})")
             return False
 
         return True
 
+    def _probe_reachable(self, host):
+        """Check with pg_isready that a server accepts connections, without logging in"""
+        if not self.pg_isready_path:
+            return True
+
+        try:
+            result = subprocess.run([self.pg_isready_path, '-h', host, '-p', str(self.port)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0
+
+    def _check_connection(self, use_destination=False):
+        """Validate credentials with SELECT 1 on a pooled connection, kept for later use"""
+        conn = self.get_connection(use_destination=use_destination)
+        if not conn:
+            return False
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            return True
+        except psycopg2.Error as e:
+            logger.error(f"Connection error: {e}")
+            return False
+        finally:
+            self.release_connection(conn, use_destination=use_destination)
+
     def list_databases(self, use_destination=False, exclude_system=True):
         """List databases on source or destination server"""
         conn = self.get_connection(use_destination=use_destination)
@@ -164,10 +419,10 @@ class BulkDBMigrator:
             return databases
 
         except psycopg2.Error as e:
-            print(f"Error listing databases: {e}")
+            logger.error(f"Error listing databases: {e}")
             return []
         finally:
-            conn.close()
+            self.release_connection(conn, use_destination=use_destination)
 
     def database_exists(self, database_name, use_destination=False):
         """Check if database exists"""
@@ -184,10 +439,59 @@ class BulkDBMigrator:
         except psycopg2.Error:
             return False
         finally:
-            conn.close()
+            self.release_connection(conn, use_destination=use_destination)
+
+    def existing_databases(self, database_names, use_destination=False):
+        """Return which of the given databases exist, with a single query (None on error)"""
+        conn = self.get_connection(use_destination=use_destination)
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT datname FROM pg_database WHERE datname = ANY(%s)", (list(database_names),))
+            existing = {row[0] for row in cursor.fetchall()}
+            cursor.close()
+            return existing
+        except psycopg2.Error as e:
+            logger.error(f"Error checking databases: {e}")
+            return None
+        finally:
+            self.release_connection(conn, use_destination=use_destination)
+
+    def database_locale(self, database_name, use_destination=False):
+        """Get (encoding, collate, ctype) of a database, or None if unavailable"""
+        conn = self.get_connection(use_destination=use_destination)
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pg_encoding_to_char(encoding), datcollate, datctype
+                FROM pg_database WHERE datname = %s
+            """, (database_name,))
+            locale = cursor.fetchone()
+            cursor.close()
+            return locale
+        except psycopg2.Error as e:
+            logger.error(f"Error reading locale of '{database_name}': {e}")
+            return None
+        finally:
+            self.release_connection(conn, use_destination=use_destination)
 
     def create_database(self, database_name):
-        """Create database on destination server"""
+        """Create database on destination server, matching the source encoding and locale"""
+        query = sql.SQL('CREATE DATABASE {}').format(sql.Identifier(database_name))
+
+        # template0 is required to override template1's encoding and collation
+        locale = self.database_locale(database_name, use_destination=False)
+        if locale:
+            encoding, collate, ctype = locale
+            query += sql.SQL(' WITH ENCODING {} LC_COLLATE {} LC_CTYPE {} TEMPLATE template0').format(
+                sql.Literal(encoding), sql.Literal(collate), sql.Literal(ctype)
+            )
+
         conn = self.get_connection(use_destination=True)
         if not conn:
             return False
@@ -195,69 +499,145 @@ class BulkDBMigrator:
         try:
             conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             cursor = conn.cursor()
-            cursor.execute(f'CREATE DATABASE "{database_name}"')
+            cursor.execute(query)
             cursor.close()
             return True
         except psycopg2.Error as e:
-            print(f"Error creating database '{database_name}': {e}")
+            logger.error(f"Error creating database '{database_name}': {e}")
             return False
         finally:
-            conn.close()
+            self.release_connection(conn, use_destination=True)
+
+    def drop_database(self, database_name):
+        """Drop database on destination server"""
+        # The pools and every server-level query depend on it
+        if database_name == MAINTENANCE_DB:
+            logger.error(f"Refusing to drop the maintenance database '{MAINTENANCE_DB}'")
+            return False
+
+        conn = self.get_connection(use_destination=True)
+        if not conn:
+            return False
+
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = conn.cursor()
+            cursor.execute(sql.SQL('DROP DATABASE {}').format(sql.Identifier(database_name)))
+            cursor.close()
+            return True
+        except psycopg2.Error as e:
+            logger.error(f"Error dropping database '{database_name}': {e}")
+            return False
+        finally:
+            self.release_connection(conn, use_destination=True)
+
+    def migrate_single_database(self, database_name, overwrite=False, exists=None):
+        """Migrate a single database from source to destination.
+
+        pg_dump is only used for the schema, written as a directory-format
+        archive. Table data is copied over the database connections without
+        touching the local disk, and indexes and constraints (post-data) are
+        restored with parallel pg_restore jobs once all tables are loaded.
 
-    def migrate_single_database(self, database_name, overwrite=False):
-        """Migrate a single database from source to destination"""
-        print(f"\n--- Migrating database: {database_name} ---")
+        exists may be passed when the caller already knows whether the
+        database exists on the destination, saving a query.
+        """
+        logger.info(f"\n--- Migrating database: {database_name} ---")
 
         # Check if database exists on destination
-        if self.database_exists(database_name, use_destination=True):
+        if exists is None:
+            exists = self.database_exists(database_name, use_destination=True)
+        if exists:
             if not overwrite:
-                print(f"⚠ Database '{database_name}' exists on destination. Use --overwrite to replace.")
+                logger.warning(f"⚠ Database '{database_name}' exists on destination. Use --overwrite to replace.")
                 return False
             else:
-                print(f"! Overwriting existing database '{database_name}'")
-
-        # Create backup file path
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = os.path.join(self.temp_dir, f"{database_name}_{timestamp}.sql")
+                logger.info(f"! Overwriting existing database '{database_name}'")
 
+        work_dir = None
+        source_conn = None
         try:
-            # Step 1: Backup from source
-            dump_type = "INSERT" if self.use_inserts else "COPY"
-            print(f"1. Backing up from source (using {dump_type} format)...")
-            if not self._backup_database(database_name, backup_file):
+            # Hold one source snapshot from the schema dump to the end of the
+            # data copy, so a live source can't change between the two
+            source_conn = self.get_connection(use_destination=False, database=database_name)
+            if not source_conn:
+                return False
+            snapshot = self._export_snapshot(source_conn)
+
+            # Create backup path in a per-database directory so parallel
+            # workers never collide; the database name may be any string, so
+            # it is never used as a path component
+            work_dir = tempfile.mkdtemp(prefix='db-', dir=self.temp_dir)
+            timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_dir = os.path.join(work_dir, f"schema_{timestamp}")
+
+            # Step 1: Backup schema from source
+            logger.info(f"1. Backing up schema from source...")
+            if not self._backup_database(database_name, backup_dir, snapshot):
                 return False
 
-            # Step 2: Create database on destination (if needed)
-            print(f"2. Creating database on destination...")
-            if not self.database_exists(database_name, use_destination=True):
-                if not self.create_database(database_name):
+            # Step 2: Create database on destination (replacing it if overwriting)
+            logger.info(f"2. Creating database on destination...")
+            if exists:
+                if not self.drop_database(database_name):
                     return False
-            else:
-                print(f"   Database already exists")
+                logger.info(f"   Dropped existing database")
+            if not self.create_database(database_name):
+                return False
+
+            # Step 3: Restore tables and types to destination
+            logger.info(f"3. Restoring schema to destination...")
+            if not self._restore_database(database_name, backup_dir, section='pre-data'):
+                return False
 
-            # Step 3: Restore to destination
-            print(f"3. Restoring to destination...")
-            if not self._restore_database(database_name, backup_file):
+            # Step 4: Copy table data from source to destination
+            data_format = "INSERT statements" if self.use_inserts else "binary COPY"
+            logger.info(f"4. Copying table data ({data_format})...")
+            if not self._copy_table_data(database_name, source_conn, snapshot):
                 return False
+            self.release_connection(source_conn, use_destination=False)
+            source_conn = None
 
-            # Step 4: Cleanup
-            print(f"4. Cleaning up temporary files...")
-            os.remove(backup_file)
+            # Step 5: Build indexes and constraints on the loaded tables
+            logger.info(f"5. Restoring indexes and constraints...")
+            if not self._restore_database(database_name, backup_dir, section='post-data'):
+                return False
+
+            # Step 6: Cleanup
+            logger.info(f"6. Cleaning up temporary files...")
 
-            print(f"✓ Successfully migrated database '{database_name}'")
+            logger.info(f"✓ Successfully migrated database '{database_name}'")
             return True
 
         except Exception as e:
-            print(f"✗ Migration failed for '{database_name}': {e}")
-            # Cleanup on failure
-            if os.path.exists(backup_file):
-                os.remove(backup_file)
+            logger.error(f"✗ Migration failed for '{database_name}': {e}")
             return False
 
-    def _backup_database(self, database_name, backup_file):
-        """Internal method to backup database"""
+        finally:
+            if source_conn:
+                self.release_connection(source_conn, use_destination=False)
+            # Cleanup temporary files on success and failure
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _export_snapshot(self, source_conn):
+        """Start a read-only REPEATABLE READ transaction and export its snapshot"""
+        source_conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        cursor = source_conn.cursor()
+        cursor.execute("SELECT pg_export_snapshot()")
+        snapshot = cursor.fetchone()[0]
+        cursor.close()
+        return snapshot
+
+    def _backup_database(self, database_name, backup_dir, snapshot=None):
+        """Internal method to backup the database schema.
+
+        Normally a directory-format archive for pg_restore; with --inprocess,
+        one plain SQL file per section to run over a database connection.
+        snapshot is an exported snapshot for pg_dump to read from.
+        """
         if not self.pg_dump_path:
-            print("   ✗ pg_dump not found")
+            logger.error("   ✗ pg_dump not found")
             return False
 
         try:
@@ -267,162 +647,624 @@ class BulkDBMigrator:
                 '-p', str(self.port),
                 '-U', self.source_user,
                 '-d', database_name,
-                '-f', backup_file,
-                '--no-password',
-                '--verbose'
+                '--no-password'
             ]
-
-            # Add INSERT option if requested
-            if self.use_inserts:
-                cmd.append('--inserts')  # Use INSERT statements instead of COPY
-                # Alternative: use --column-inserts for INSERT with column names
-                # cmd.append('--column-inserts')
-
-            env = os.environ.copy()
-            env['PGPASSWORD'] = self.source_password
-
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-
-            if result.returncode == 0:
-                file_size = os.path.getsize(backup_file)
-                format_note = " (INSERT format)" if self.use_inserts else " (COPY format)"
-                print(f"   ✓ Backup created ({file_size} bytes){format_note}")
-                return True
+            if snapshot:
+                cmd.extend(['--snapshot', snapshot])
+            if self.debug:
+                cmd.append('--verbose')
+
+            if self.inprocess:
+                # The script runs as one transaction, so leave out statements
+                # that fail when the destination lacks the source's roles
+                os.makedirs(backup_dir, exist_ok=True)
+                commands = [
+                    cmd + ['-E', 'UTF8', '--no-owner', '--no-privileges', '--section', section,
+                           '-f', os.path.join(backup_dir, f"{section}.sql")]
+                    for section in SCHEMA_SECTIONS
+                ]
             else:
-                print(f"   ✗ Backup failed: {result.stderr}")
-                return False
+                # Sections (not --schema-only) keep materialized view refreshes
+                commands = [
+                    cmd + ['-Fd', '-Z', self.compress,
+                           '--section', 'pre-data', '--section', 'post-data', '-f', backup_dir]
+                ]
+
+            for command in commands:
+                returncode, stderr = self._run_tool(command, self.source_password)
+                if returncode != 0:
+                    logger.error(f"   ✗ Backup failed: {stderr}")
+                    return False
+
+            logger.info(f"   ✓ Schema backup created")
+            return True
 
         except Exception as e:
-            print(f"   ✗ Backup error: {e}")
+            logger.error(f"   ✗ Backup error: {e}")
             return False
 
-    def _restore_database(self, database_name, backup_file):
-        """Internal method to restore database"""
-        if not self.psql_path:
-            print("   ✗ psql not found")
+    def _restore_database(self, database_name, backup_dir, section):
+        """Internal method to restore one section of a schema backup"""
+        if self.inprocess:
+            return self._apply_schema_sql(database_name, os.path.join(backup_dir, f"{section}.sql"))
+
+        if not self.pg_restore_path:
+            logger.error("   ✗ pg_restore not found")
             return False
 
         try:
             cmd = [
-                self.psql_path,
+                self.pg_restore_path,
                 '-h', self.dest_host,
                 '-p', str(self.port),
                 '-U', self.dest_user,
                 '-d', database_name,
-                '-f', backup_file,
-                '--no-password'
+                '-Fd',
+                '-j', str(self.pg_jobs),
+                '--section', section,
+                '--no-password',
+                backup_dir
             ]
+            if self.no_owner:
+                cmd.extend(['--no-owner', '--no-privileges'])
+            if self.debug:
+                cmd.append('--verbose')
 
-            env = os.environ.copy()
-            env['PGPASSWORD'] = self.dest_password
-
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            returncode, stderr = self._run_tool(cmd, self.dest_password, options=self.bulk_load_options)
 
-            if result.returncode == 0:
-                print(f"   ✓ Restore completed")
+            if returncode == 0:
+                logger.info(f"   ✓ Restore completed")
+                return True
+            elif returncode == 1 and PG_RESTORE_IGNORED_ERRORS in stderr:
+                # Like psql -f, carry on past statements that failed
+                logger.warning(f"   ⚠ Restore completed with errors: {stderr}")
                 return True
             else:
-                print(f"   ✗ Restore failed: {result.stderr}")
+                logger.error(f"   ✗ Restore failed: {stderr}")
                 return False
 
         except Exception as e:
-            print(f"   ✗ Restore error: {e}")
+            logger.error(f"   ✗ Restore error: {e}")
             return False
 
-    def migrate_all_databases(self, exclude_databases=None, overwrite=False):
-        """Migrate all databases from source to destination"""
+    def _run_tool(self, cmd, password, options=None):
+        """Run pg_dump/pg_restore, reading its stderr as it is produced.
+
+        Only the last STDERR_TAIL_LINES lines are kept for error reports, so
+        memory stays bounded however much the tool logs; with --debug every
+        line is also logged as it arrives. options are added to PGOPTIONS.
+        Returns (returncode, stderr tail).
+        """
+        env = os.environ.copy()
+        env['PGPASSWORD'] = password
+        if options:
+            env['PGOPTIONS'] = f"{env.get('PGOPTIONS', '')} {options}".strip()
+
+        # Server messages may not be UTF-8 (e.g. from a LATIN1 database)
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True, errors='replace', bufsize=1)
+        tail = collections.deque(maxlen=STDERR_TAIL_LINES)
+        finished = False
+        try:
+            with proc.stderr:
+                for line in proc.stderr:
+                    tail.append(line)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"   {line.rstrip()}")
+            finished = True
+        finally:
+            # Never leave the tool running on files the caller may delete
+            if not finished:
+                proc.kill()
+                proc.wait()
+        returncode = proc.wait()
+        return returncode, ''.join(tail)
+
+    def _apply_schema_sql(self, database_name, sql_file):
+        """Internal method to run a plain schema dump over a destination connection"""
+        conn = self.get_connection(use_destination=True, database=database_name)
+        if not conn:
+            return False
+
+        try:
+            with open(sql_file, encoding='utf-8') as f:
+                ddl = ''.join(line for line in f if not line.startswith(PSQL_META_COMMANDS))
+
+            conn.set_client_encoding('UTF8')
+            cursor = conn.cursor()
+            cursor.execute(ddl)
+            cursor.close()
+            conn.commit()
+
+            logger.info(f"   ✓ Restore completed")
+            return True
+
+        except (psycopg2.Error, OSError) as e:
+            logger.error(f"   ✗ Restore failed: {e}")
+            return False
+        finally:
+            self.release_connection(conn, use_destination=True)
+
+    def _copy_table_data(self, database_name, source_conn, snapshot):
+        """Internal method to copy all table data from source to destination.
+
+        snapshot was exported by source_conn's open transaction, and the
+        schema backup was taken from it too. Tables are shared out to up to pg_jobs workers,
+        largest first, each with its own pair of connections; workers import
+        the snapshot, so every table is read consistently with the schema.
+        """
+        try:
+            tables = self._list_tables(source_conn)
+            table_queue = queue.Queue()
+            for table in tables:
+                table_queue.put(table)
+            stop = threading.Event()
+
+            workers = max(1, min(self.pg_jobs, len(tables)))
+            if workers == 1:
+                copied = self._copy_tables(database_name, table_queue, stop, source_conn=source_conn)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(self._copy_tables, database_name, table_queue, stop, snapshot=snapshot)
+                        for _ in range(workers)
+                    ]
+                    copied = all([future.result() for future in futures])
+
+            if not copied:
+                return False
+
+            dest_conn = self._get_data_connection(database_name)
+            if not dest_conn:
+                return False
+            try:
+                self._copy_sequence_values(source_conn, dest_conn)
+                large_objects = self._copy_large_objects(source_conn, dest_conn)
+                dest_conn.commit()
+            finally:
+                self.release_connection(dest_conn, use_destination=True)
+
+            logger.info(f"   ✓ Copied {len(tables)} tables")
+            if large_objects:
+                logger.info(f"   ✓ Copied {large_objects} large objects")
+            return True
+
+        except DB_ERRORS + (OSError,) as e:
+            logger.error(f"   ✗ Data copy failed: {e}")
+            return False
+
+    def _copy_tables(self, database_name, table_queue, stop, source_conn=None, snapshot=None):
+        """Internal method run by each data worker: copy tables until the queue is empty"""
+        own_source = source_conn is None
+        if own_source:
+            source_conn = self.get_connection(use_destination=False, database=database_name)
+            if not source_conn:
+                stop.set()
+                return False
+
+        dest_conn = self._get_data_connection(database_name)
+        if not dest_conn:
+            stop.set()
+            if own_source:
+                self.release_connection(source_conn, use_destination=False)
+            return False
+
+        try:
+            if snapshot:
+                source_conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+                cursor = source_conn.cursor()
+                cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+                cursor.close()
+
+            # Stop early once another worker has failed
+            while not stop.is_set():
+                try:
+                    schema, table, binary, condition = table_queue.get_nowait()
+                except queue.Empty:
+                    return True
+
+                if self.use_inserts:
+                    self._copy_table_via_inserts(source_conn, dest_conn, schema, table, condition=condition)
+                else:
+                    self._copy_table(source_conn, dest_conn, schema, table, binary=binary, condition=condition)
+                dest_conn.commit()
+                logger.info(f"   ✓ {schema}.{table}")
+            return False
+
+        except DB_ERRORS + (OSError,) as e:
+            stop.set()
+            logger.error(f"   ✗ Data copy failed: {e}")
+            return False
+        finally:
+            self.release_connection(dest_conn, use_destination=True)
+            if own_source:
+                self.release_connection(source_conn, use_destination=False)
+
+    def _get_data_connection(self, database_name):
+        """Internal method to get the destination connection used to load data"""
+        if self.use_inserts:
+            # INSERT batches can be pipelined; COPY needs a psycopg2 connection
+            conn = self.get_pipeline_connection(database_name)
+            if conn:
+                return conn
+        return self.get_connection(use_destination=True, database=database_name)
+
+    def _list_tables(self, conn):
+        """List user tables holding data, largest first (no partitioned parents or extension members).
+
+        Returns (schema, table, binary, condition) tuples. binary is False for
+        tables with composite columns or arrays of user-defined types
+        (including through domains): their binary form embeds type OIDs, which
+        differ on the destination, so like pg_dump they are copied as text.
+
+        Extension configuration tables (pg_extension_config_dump) are included
+        like pg_dump does, with condition holding their WHERE filter; it is
+        None for all other tables.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT n.nspname, c.relname, NOT EXISTS (
+                WITH RECURSIVE column_types(oid) AS (
+                    SELECT a.atttypid FROM pg_attribute a
+                    WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+                    UNION
+                    SELECT t.typbasetype FROM pg_type t
+                    JOIN column_types ct ON ct.oid = t.oid
+                    WHERE t.typtype = 'd'
+                )
+                SELECT 1 FROM column_types ct
+                JOIN pg_type t ON t.oid = ct.oid
+                WHERE t.typtype = 'c'
+                OR (t.typlen = -1 AND t.typelem >= %s)
+            ), ec.condition
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN (
+                SELECT unnest(extconfig) AS oid, unnest(extcondition) AS condition
+                FROM pg_extension
+            ) ec ON ec.oid = c.oid
+            WHERE c.relkind = 'r'
+            AND c.relpersistence <> 't'
+            AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+            AND (ec.oid IS NOT NULL OR NOT EXISTS (
+                SELECT 1 FROM pg_depend d
+                WHERE d.classid = 'pg_class'::regclass
+                AND d.objid = c.oid
+                AND d.deptype = 'e'
+            ))
+            ORDER BY c.relpages DESC, n.nspname, c.relname
+        """, (FIRST_NORMAL_OBJECT_ID,))
+        tables = cursor.fetchall()
+        cursor.close()
+        return tables
+
+    def _copy_table(self, source_conn, dest_conn, schema, table, binary=True, condition=None):
+        """Pipe COPY TO STDOUT on the source into COPY FROM STDIN on the destination.
+
+        The source side runs in a separate thread writing into an OS pipe while
+        the destination reads from it, so rows flow through without being
+        buffered in full or written to disk. binary=False uses text format;
+        condition is a WHERE clause limiting the rows copied.
+        """
+        table_name = sql.Identifier(schema, table)
+        copy_format = sql.SQL(' WITH BINARY' if binary else '')
+        source = table_name
+        if condition:
+            source = sql.SQL('(SELECT * FROM {} {})').format(table_name, sql.SQL(condition))
+        read_fd, write_fd = os.pipe()
+        errors = []
+
+        def produce():
+            try:
+                with os.fdopen(write_fd, 'wb', buffering=self.copy_chunk_size) as writer:
+                    cursor = source_conn.cursor()
+                    cursor.copy_expert(
+                        sql.SQL('COPY {} TO STDOUT{}').format(source, copy_format), writer
+                    )
+                    cursor.close()
+            except Exception as e:
+                errors.append(e)
+
+        producer = threading.Thread(target=produce, name=f"copy {schema}.{table}", daemon=True)
+        producer.start()
+
+        try:
+            # Closing the reader on failure breaks the pipe and stops the producer
+            with os.fdopen(read_fd, 'rb', buffering=self.copy_chunk_size) as reader:
+                cursor = dest_conn.cursor()
+                cursor.copy_expert(sql.SQL('COPY {} FROM STDIN{}').format(table_name, copy_format), reader,
+                                   size=self.copy_chunk_size)
+                cursor.close()
+        finally:
+            producer.join()
+
+        # A failed source ends the stream early, so never keep what was loaded
+        if errors:
+            raise errors[0]
+
+    def _copy_table_via_inserts(self, source_conn, dest_conn, schema, table, batch=INSERT_BATCH_SIZE,
+                                condition=None):
+        """Copy one table with batched multi-row INSERTs in a single transaction.
+
+        Values are read in their text form, like pg_dump --inserts, so every
+        column type round-trips without client-side conversion.
+        """
+        source_cursor = source_conn.cursor()
+        source_cursor.execute("""
+            SELECT column_name, identity_generation
+            FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s
+            AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """, (schema, table))
+        columns = source_cursor.fetchall()
+        source_cursor.close()
+        if not columns:
+            return
+
+        table_name = sql.Identifier(schema, table)
+        column_list = sql.SQL(', ').join(sql.Identifier(name) for name, _ in columns)
+        select_list = sql.SQL(', ').join(
+            sql.SQL('{}::text').format(sql.Identifier(name)) for name, _ in columns
+        )
+        overriding = any(identity == 'ALWAYS' for _, identity in columns)
+
+        # Server-side cursor so only one batch of rows is held in memory
+        source_cursor = source_conn.cursor(name=f"dbmigrate_{threading.get_ident()}")
+        source_cursor.itersize = batch
+        source_cursor.execute(sql.SQL('SELECT {} FROM {} {}').format(
+            select_list, table_name, sql.SQL(condition or '')
+        ))
+
+        insert_sql = sql.SQL('INSERT INTO {} ({}) {}VALUES ').format(
+            table_name,
+            column_list,
+            sql.SQL('OVERRIDING SYSTEM VALUE ' if overriding else '')
+        )
+
+        pipelined = self._is_pipeline_connection(dest_conn)
+        if pipelined:
+            # Server-side binding caps the parameters of one statement
+            page_size = max(1, min(batch, MAX_QUERY_PARAMETERS // len(columns)))
+            row_values = sql.SQL('({})').format(sql.SQL(', ').join(sql.Placeholder() * len(columns)))
+            statements = {}
+        else:
+            insert_sql += sql.Placeholder()
+
+        dest_cursor = dest_conn.cursor()
+        with self._pipeline(dest_conn):
+            while True:
+                rows = source_cursor.fetchmany(batch)
+                if not rows:
+                    break
+                if not pipelined:
+                    psycopg2.extras.execute_values(dest_cursor, insert_sql, rows, page_size=batch)
+                    continue
+
+                # The same multi-row INSERT as execute_values, with the pages
+                # sent back to back without waiting for replies
+                for start in range(0, len(rows), page_size):
+                    page = rows[start:start + page_size]
+                    statement = statements.get(len(page))
+                    if statement is None:
+                        # psycopg 3 cannot run psycopg2 compositions, so render it first
+                        statement = (insert_sql + sql.SQL(', ').join([row_values] * len(page))).as_string(source_conn)
+                        statements[len(page)] = statement
+                    dest_cursor.execute(statement, [value for row in page for value in row])
+
+        dest_cursor.close()
+        source_cursor.close()
+
+    def _copy_sequence_values(self, source_conn, dest_conn):
+        """Copy current sequence values (part of the data section in pg_dump)"""
+        source_cursor = source_conn.cursor()
+        source_cursor.execute("""
+            SELECT quote_ident(schemaname) || '.' || quote_ident(sequencename), last_value
+            FROM pg_sequences
+            WHERE last_value IS NOT NULL
+        """)
+        sequences = source_cursor.fetchall()
+        source_cursor.close()
+
+        dest_cursor = dest_conn.cursor()
+        with self._pipeline(dest_conn):
+            dest_cursor.executemany("SELECT pg_catalog.setval(%s, %s, true)", sequences)
+        dest_cursor.close()
+
+    def _copy_large_objects(self, source_conn, dest_conn):
+        """Copy large object contents (part of the data section in pg_dump).
+
+        The pre-data section already created each object, empty and with the
+        same OID, so only the contents are written, one chunk at a time.
+        Returns the number of large objects.
+        """
+        source_cursor = source_conn.cursor()
+        source_cursor.execute("SELECT oid FROM pg_largeobject_metadata ORDER BY oid")
+        oids = [row[0] for row in source_cursor.fetchall()]
+
+        dest_cursor = dest_conn.cursor()
+        for oid in oids:
+            offset = 0
+            while True:
+                source_cursor.execute("SELECT lo_get(%s, %s, %s)", (oid, offset, self.copy_chunk_size))
+                chunk = source_cursor.fetchone()[0]
+                if not chunk:
+                    break
+                dest_cursor.execute("SELECT lo_put(%s, %s, %s)", (oid, offset, chunk))
+                offset += len(chunk)
+                if len(chunk) < self.copy_chunk_size:
+                    break
+
+        dest_cursor.close()
+        source_cursor.close()
+        return len(oids)
+
+    @staticmethod
+    def _is_pipeline_connection(conn):
+        """Whether conn is a psycopg 3 connection (see get_pipeline_connection)"""
+        return psycopg is not None and isinstance(conn, psycopg.Connection)
+
+    def _pipeline(self, conn):
+        """Pipeline mode for psycopg 3 connections, a no-op for psycopg2 ones"""
+        if self._is_pipeline_connection(conn):
+            return conn.pipeline()
+        return contextlib.nullcontext()
+
+    def migrate_all_databases(self, exclude_databases=None, overwrite=False, assume_yes=False):
+        """Migrate all databases from source to destination (assume_yes skips confirmation)"""
         if exclude_databases is None:
             exclude_databases = []
 
-        print("=== BULK DATABASE MIGRATION ===")
-        print(f"Source: {self.source_host}")
-        print(f"Destination: {self.dest_host}")
-        dump_format = "INSERT statements" if self.use_inserts else "COPY statements"
-        print(f"Format: {dump_format}")
+        logger.info("=== BULK DATABASE MIGRATION ===")
+        logger.info(f"Source: {self.source_host}")
+        logger.info(f"Destination: {self.dest_host}")
+        dump_format = "INSERT statements" if self.use_inserts else "binary COPY stream"
+        logger.info(f"Format: {dump_format}")
+        logger.info(f"Parallel jobs: {self.jobs}")
 
         # Get list of source databases
         source_databases = self.list_databases(use_destination=False)
         if not source_databases:
-            print("No databases found on source server.")
+            logger.info("No databases found on source server.")
             return
 
         # Filter out excluded databases
         databases_to_migrate = [db for db in source_databases if db not in exclude_databases]
 
-        print(f"\nDatabases to migrate: {len(databases_to_migrate)}")
+        logger.info(f"\nDatabases to migrate: {len(databases_to_migrate)}")
         for db in databases_to_migrate:
-            print(f"  - {db}")
+            logger.info(f"  - {db}")
 
         if exclude_databases:
-            print(f"\nExcluded databases: {exclude_databases}")
+            logger.info(f"\nExcluded databases: {exclude_databases}")
 
         # Confirm migration
-        if not self._confirm_migration(databases_to_migrate):
-            print("Migration cancelled.")
-            return
-
-        # Migrate each database
+        if not assume_yes:
+            # Don't hold idle server connections while waiting on the user;
+            # the pools reconnect on demand afterwards
+            self.close()
+            if not self._confirm_migration(databases_to_migrate):
+                logger.info("Migration cancelled.")
+                return
+
+        # Check which databases already exist on destination in one query
+        existing = self.existing_databases(databases_to_migrate, use_destination=True)
+
+        # Migrate databases in parallel, counting results as they complete
         successful = 0
         failed = 0
 
-        for database in databases_to_migrate:
-            if self.migrate_single_database(database, overwrite=overwrite):
-                successful += 1
-            else:
-                failed += 1
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [
+                executor.submit(self.migrate_single_database, database, overwrite=overwrite,
+                                exists=None if existing is None else database in existing)
+                for database in databases_to_migrate
+            ]
+            for future in as_completed(futures):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
 
         # Summary
-        print(f"\n=== MIGRATION SUMMARY ===")
-        print(f"✓ Successful: {successful}")
-        print(f"✗ Failed: {failed}")
-        print(f"Total: {len(databases_to_migrate)}")
+        logger.info(f"\n=== MIGRATION SUMMARY ===")
+        logger.info(f"✓ Successful: {successful}")
+        logger.info(f"✗ Failed: {failed}")
+        logger.info(f"Total: {len(databases_to_migrate)}")
 
     def _confirm_migration(self, databases):
         """Ask user to confirm migration"""
-        format_note = " using INSERT statements" if self.use_inserts else " using COPY statements"
-        print(f"\nAbout to migrate {len(databases)} databases{format_note}.")
+        format_note = " using INSERT statements" if self.use_inserts else " using binary COPY"
+        logger.info(f"\nAbout to migrate {len(databases)} databases{format_note}.")
         if self.use_inserts:
-            print("⚠ Note: INSERT format is slower but more portable than COPY format.")
+            logger.warning("⚠ Note: INSERT format is slower but more portable than COPY format.")
+        # Make sure the summary is on screen before prompting
+        _flush_logging()
         response = input("Continue? (y/N): ").strip().lower()
         return response in ['y', 'yes']
 
     def show_comparison(self):
         """Show comparison between source and destination servers"""
-        print("=== SERVER COMPARISON ===")
+        logger.info("=== SERVER COMPARISON ===")
 
-        print(f"\nSource server ({self.source_host}):")
-        source_dbs = self.list_databases(use_destination=False)
+        # Query both servers at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_dbs, dest_dbs = executor.map(
+                lambda use_destination: self.list_databases(use_destination=use_destination),
+                (False, True)
+            )
+
+        logger.info(f"\nSource server ({self.source_host}):")
         for db in source_dbs:
-            print(f"  - {db}")
+            logger.info(f"  - {db}")
 
-        print(f"\nDestination server ({self.dest_host}):")
-        dest_dbs = self.list_databases(use_destination=True)
+        logger.info(f"\nDestination server ({self.dest_host}):")
         for db in dest_dbs:
-            print(f"  - {db}")
+            logger.info(f"  - {db}")
 
-        # Show differences
-        only_in_source = set(source_dbs) - set(dest_dbs)
-        only_in_dest = set(dest_dbs) - set(source_dbs)
-        common = set(source_dbs) & set(dest_dbs)
+        # Show differences; both lists are already sorted by the query
+        source_set = frozenset(source_dbs)
+        dest_set = frozenset(dest_dbs)
+        only_in_source = [db for db in source_dbs if db not in dest_set]
+        only_in_dest = [db for db in dest_dbs if db not in source_set]
+        common = [db for db in source_dbs if db in dest_set]
 
         if only_in_source:
-            print(f"\nOnly in source ({len(only_in_source)}):")
-            for db in sorted(only_in_source):
-                print(f"  - {db}")
+            logger.info(f"\nOnly in source ({len(only_in_source)}):")
+            for db in only_in_source:
+                logger.info(f"  - {db}")
 
         if only_in_dest:
-            print(f"\nOnly in destination ({len(only_in_dest)}):")
-            for db in sorted(only_in_dest):
-                print(f"  - {db}")
+            logger.info(f"\nOnly in destination ({len(only_in_dest)}):")
+            for db in only_in_dest:
+                logger.info(f"  - {db}")
 
         if common:
-            print(f"\nCommon databases ({len(common)}):")
-            for db in sorted(common):
-                print(f"  - {db}")
+            logger.info(f"\nCommon databases ({len(common)}):")
+            for db in common:
+                logger.info(f"  - {db}")
+
+
+def _positive_int(value):
+    """argparse type for job counts: an integer of at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return number
+
+
+def _memory_size(value):
+    """argparse type for PostgreSQL memory settings such as '2GB' or '512 MB'.
+
+    Spaces are removed because the value is passed in a libpq options string,
+    where they would separate arguments.
+    """
+    size = value.replace(' ', '')
+    if not re.fullmatch(r'\d+(kB|MB|GB|TB)?', size):
+        raise argparse.ArgumentTypeError(f"must be a size such as 512MB or 2GB: {value!r}")
+    return size
+
+
+def _compression(value):
+    """argparse type for pg_dump -Z: a level, or a method with optional detail such as zstd:3"""
+    if not re.fullmatch(r'\d|none|(gzip|lz4|zstd)(:[\w=,]+)?', value):
+        raise argparse.ArgumentTypeError(f"must be a level 0-9 or gzip, lz4, zstd or none: {value!r}")
+    return value
 
 
 def main():
-    parser = argparse.ArgumentParser(description='Bulk PostgreSQL Database Migration Tool')
+    parser = argparse.ArgumentParser(
+        description='Bulk PostgreSQL Database Migration Tool',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='Each database is migrated in three sections, like pg_restore does:\n'
+               '  1. pre-data: tables, types and functions (without indexes)\n'
+               '  2. data: table contents, loaded into index-free tables\n'
+               '  3. post-data: indexes, constraints and triggers, built once over the loaded data\n'
+               '--pg-jobs runs the data and post-data sections with parallel workers.'
+    )
 
     # Source server settings
     parser.add_argument('--source-host', required=True, help='Source database host')
@@ -438,6 +1280,26 @@ def main():
     parser.add_argument('--port', type=int, default=5432, help='Database port (same for both servers)')
     parser.add_argument('--use-inserts', action='store_true',
                        help='Use INSERT statements instead of COPY (slower but more portable)')
+    parser.add_argument('--copy-chunk-size', type=_positive_int, default=COPY_CHUNK_SIZE,
+                       help='Buffer size in bytes for streaming table data (default: 1 MiB)')
+    parser.add_argument('--inprocess', action='store_true',
+                       help='Apply the schema over the database connection instead of running pg_restore '
+                            '(fewer process spawns for many small databases; indexes are built serially)')
+    parser.add_argument('--maintenance-work-mem', type=_memory_size, default='2GB',
+                       help='maintenance_work_mem for index builds on the destination, per parallel job '
+                            '(default: 2GB)')
+    parser.add_argument('--no-owner', action='store_true',
+                       help='Do not restore object ownership and privileges (always the case with --inprocess)')
+    parser.add_argument('--debug', action='store_true',
+                       help='Log debug output, including pg_dump/pg_restore --verbose output as it arrives')
+    parser.add_argument('--jobs', type=_positive_int, default=1,
+                       help='Number of databases to migrate in parallel (default: 1)')
+    parser.add_argument('--pg-jobs', type=_positive_int, default=1,
+                       help='Number of parallel jobs per database for copying tables and '
+                            'building indexes (default: 1)')
+    parser.add_argument('--compress', type=_compression, default='0',
+                       help='Compression of the temporary schema archive, passed to pg_dump -Z '
+                            '(e.g. 6, gzip:6, or zstd:3 with pg_dump 16+; default: 0)')
 
     # Actions
     subparsers = parser.add_subparsers(dest='action', help='Available actions')
@@ -457,6 +1319,8 @@ def main():
     migrate_all = subparsers.add_parser('migrate-all', help='Migrate all databases')
     migrate_all.add_argument('--exclude', nargs='*', default=[], help='Databases to exclude from migration')
     migrate_all.add_argument('--overwrite', action='store_true', help='Overwrite existing databases on destination')
+    migrate_all.add_argument('-y', '--yes', action='store_true',
+                             help='Do not ask for confirmation (also set by DBMIGRATE_ASSUME_YES=1)')
 
     args = parser.parse_args()
 
@@ -464,6 +1328,8 @@ def main():
         parser.print_help()
         return
 
+    setup_logging(debug=args.debug)
+
     # Create migrator
     migrator = BulkDBMigrator(
         source_host=args.source_host,
@@ -473,27 +1339,41 @@ def main():
         dest_user=args.dest_user,
         dest_password=args.dest_password,
         port=args.port,
-        use_inserts=args.use_inserts
+        use_inserts=args.use_inserts,
+        copy_chunk_size=args.copy_chunk_size,
+        jobs=args.jobs,
+        pg_jobs=args.pg_jobs,
+        compress=args.compress,
+        inprocess=args.inprocess,
+        debug=args.debug,
+        maintenance_work_mem=args.maintenance_work_mem,
+        no_owner=args.no_owner
     )
 
     # Execute actions
-    if args.action == 'test':
-        if migrator.test_connections():
-            print("✓ All connections successful!")
-        else:
-            print("✗ Connection test failed!")
-
-    elif args.action == 'compare':
-        if migrator.test_connections():
-            migrator.show_comparison()
-
-    elif args.action == 'migrate-single':
-        if migrator.test_connections():
-            migrator.migrate_single_database(args.database, overwrite=args.overwrite)
-
-    elif args.action == 'migrate-all':
-        if migrator.test_connections():
-            migrator.migrate_all_databases(exclude_databases=args.exclude, overwrite=args.overwrite)
+    try:
+        if args.action == 'test':
+            if migrator.test_connections():
+                logger.info("✓ All connections successful!")
+            else:
+                logger.error("✗ Connection test failed!")
+
+        elif args.action == 'compare':
+            if migrator.test_connections():
+                migrator.show_comparison()
+
+        elif args.action == 'migrate-single':
+            if migrator.test_connections():
+                migrator.migrate_single_database(args.database, overwrite=args.overwrite)
+
+        elif args.action == 'migrate-all':
+            if migrator.test_connections():
+                assume_yes = args.yes or os.environ.get('DBMIGRATE_ASSUME_YES') == '1'
+                migrator.migrate_all_databases(exclude_databases=args.exclude, overwrite=args.overwrite,
+                                               assume_yes=assume_yes)
+    finally:
+        migrator.close()
+        stop_logging()
 
 
 if __name__ == '__main__':